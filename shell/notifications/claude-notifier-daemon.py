@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+Long-lived daemon for the Claude Code notification handler
+
+Each hook event normally fork/execs a fresh python3, re-imports
+sqlite3/logging/subprocess and re-opens the database — hundreds of ms of
+interpreter and linker work per event. This daemon pays those costs once:
+it binds a Unix datagram socket at ~/.claude/notifier/hook.sock,
+instantiates ClaudeNotifier a single time, and dispatches each payload
+claude-notifier.py forwards to it.
+
+Payload format (what claude-notifier.py sends):
+
+    <hook_event>\n<json from stdin>
+
+Start it from a launchd agent / systemd user unit, or manually:
+
+    python3 claude-notifier-daemon.py
+
+claude-notifier.py falls back to in-process handling when the daemon is
+not running, so enabling it is purely an optimization.
+"""
+
+import importlib.util
+import json
+import logging
+import signal
+import socket
+import sys
+import threading
+import time
+from pathlib import Path
+
+BASE_DIR = Path.home() / ".claude" / "notifier"
+SOCKET_PATH = BASE_DIR / "hook.sock"
+
+# How often buffered task rows are written out
+FLUSH_INTERVAL_SECS = 1.0
+
+# Receive buffer for hook datagrams. Linux caps a Unix datagram at
+# net.core.wmem_max (defaults allow ~208 KiB), so read with a buffer
+# above that: a datagram larger than the buffer is silently truncated,
+# not rejected. Sends the kernel won't accept fail client-side with
+# EMSGSIZE, where claude-notifier.py falls back to in-process handling.
+RECV_BUFSIZE = 512 * 1024
+
+
+def load_notifier_module():
+    """Import claude-notifier.py (hyphenated name, so load it by path)"""
+    path = Path(__file__).with_name("claude-notifier.py")
+    spec = importlib.util.spec_from_file_location("claude_notifier", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def make_buffered_notifier(notifier_module):
+    """Build a ClaudeNotifier subclass that batches task writes.
+
+    In single-shot hook mode every UserPromptSubmit/Stop pays a full
+    open-transact-fsync-close cycle. The daemon instead accumulates
+    inserts and completions in memory and flushes them in one
+    transaction every FLUSH_INTERVAL_SECS (and on shutdown). Stop
+    notifications compute the duration from the cached start time, so
+    the user-visible path never waits on the flush.
+    """
+
+    class BufferedNotifier(notifier_module.ClaudeNotifier):
+        def __init__(self):
+            super().__init__()
+            self._buffer_lock = threading.Lock()
+            self._pending_inserts = []      # (session_id, prompt, cwd, seq, created_at)
+            self._pending_completions = []  # (completed_at, duration, session_id, seq)
+            self._session_seq = {}          # session_id -> last assigned seq
+            self._open_tasks = {}           # session_id -> (seq, start monotonic-ish epoch)
+
+        def _next_seq(self, session_id):
+            """Next per-session seq, seeded from the DB on first touch"""
+            seq = self._session_seq.get(session_id)
+            if seq is None:
+                self._ensure_db()
+                with self._connect() as conn:
+                    row = conn.execute(
+                        "SELECT COALESCE(MAX(seq), 0) FROM tasks WHERE session_id = ?",
+                        (session_id,)
+                    ).fetchone()
+                seq = row[0]
+            seq += 1
+            self._session_seq[session_id] = seq
+            return seq
+
+        def handle_user_prompt_submit(self, data):
+            session_id = data.get("session_id")
+            prompt = data.get("prompt", "")
+            cwd = data.get("cwd", "")
+
+            now = time.time()
+            with self._buffer_lock:
+                seq = self._next_seq(session_id)
+                self._pending_inserts.append((session_id, prompt, cwd, seq, int(now)))
+                self._open_tasks[session_id] = (seq, now)
+
+            self._ensure_logging()
+            logging.info(f"Task started: session={session_id}")
+
+        def handle_stop(self, data):
+            session_id = data.get("session_id")
+            cwd = data.get("cwd", "")
+
+            with self._buffer_lock:
+                open_task = self._open_tasks.pop(session_id, None)
+
+            if open_task is None:
+                # Daemon started mid-session; fall back to the direct path
+                super().handle_stop(data)
+                return
+
+            seq, started = open_task
+            now = time.time()
+            duration_secs = int(now - started)
+            with self._buffer_lock:
+                self._pending_completions.append(
+                    (int(now), duration_secs, session_id, seq)
+                )
+
+            duration_str = self.format_duration(duration_secs)
+
+            self.send_notification(
+                title=self.get_project_name(cwd),
+                subtitle=f"Task #{seq} complete",
+                message=f"Duration: {duration_str}",
+                sound=notifier_module.NOTIFICATION_SOUND,
+                cwd=cwd,
+                urgency="normal"
+            )
+
+            logging.info(f"Task completed: session={session_id}, seq={seq}, duration={duration_str}")
+
+        def flush(self):
+            """Write all buffered inserts/completions in one transaction"""
+            with self._buffer_lock:
+                inserts = self._pending_inserts
+                completions = self._pending_completions
+                self._pending_inserts = []
+                self._pending_completions = []
+
+            if not inserts and not completions:
+                return
+
+            self._ensure_db()
+            with self._connect() as conn:
+                conn.execute("BEGIN IMMEDIATE")
+                conn.executemany(
+                    """
+                    INSERT INTO tasks (session_id, prompt, cwd, seq, created_at)
+                    VALUES (?, ?, ?, ?, ?)
+                    """,
+                    inserts,
+                )
+                conn.executemany(
+                    """
+                    UPDATE tasks
+                    SET completed_at = ?, duration_seconds = ?
+                    WHERE session_id = ? AND seq = ? AND completed_at IS NULL
+                    """,
+                    completions,
+                )
+                conn.execute("COMMIT")
+
+    return BufferedNotifier()
+
+
+def main():
+    """Bind the hook socket and dispatch events until terminated"""
+    notifier_module = load_notifier_module()
+    notifier = make_buffered_notifier(notifier_module)
+
+    BASE_DIR.mkdir(parents=True, exist_ok=True)
+    SOCKET_PATH.unlink(missing_ok=True)
+
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+    sock.bind(str(SOCKET_PATH))
+    SOCKET_PATH.chmod(0o600)
+
+    # Exit cleanly (flushing buffers, removing the socket) on SIGTERM
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+
+    stop_flushing = threading.Event()
+
+    def flush_loop():
+        while not stop_flushing.wait(FLUSH_INTERVAL_SECS):
+            try:
+                notifier.flush()
+            except Exception as e:
+                logging.error(f"Daemon flush error: {e}")
+
+    flusher = threading.Thread(target=flush_loop, daemon=True)
+    flusher.start()
+
+    try:
+        while True:
+            data, _ = sock.recvfrom(RECV_BUFSIZE)
+            if len(data) == RECV_BUFSIZE:
+                # A full read means the datagram may have been cut off —
+                # dropping it beats recording a half-parsed task
+                logging.error(f"Dropping oversized hook datagram ({len(data)}+ bytes)")
+                continue
+            hook_event, _, payload = data.partition(b"\n")
+            try:
+                notifier.dispatch(hook_event.decode("utf-8"), json.loads(payload))
+            except Exception as e:
+                logging.error(f"Daemon error handling {hook_event!r}: {e}")
+    except (KeyboardInterrupt, SystemExit):
+        pass
+    finally:
+        stop_flushing.set()
+        sock.close()
+        SOCKET_PATH.unlink(missing_ok=True)
+        try:
+            notifier.flush()
+        except Exception as e:
+            logging.error(f"Daemon final flush error: {e}")
+
+
+if __name__ == "__main__":
+    main()
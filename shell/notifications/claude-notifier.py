@@ -14,104 +14,267 @@ Sources:
 - https://github.com/hta218/claude-code-notifier (simplicity inspiration)
 """
 
+import atexit
 import os
 import sys
 import json
+import socket
 import sqlite3
 import subprocess
 import logging
+import shlex
+import time
 from pathlib import Path
 from datetime import datetime
-from logging.handlers import TimedRotatingFileHandler
+from logging.handlers import MemoryHandler
 
 # Configuration from environment
 NOTIFICATION_SOUND = os.getenv("NOTIFICATION_SOUND", "Glass")
 EDITOR_COMMAND = os.getenv("NOTIFICATION_EDITOR", "zed")  # zed, code, cursor, etc.
 
+# Map editor commands to their open syntax ({0} is the shell-quoted cwd)
+EDITOR_TEMPLATES = {
+    "zed": "zed {0}",
+    "code": "/usr/local/bin/code {0}",
+    "cursor": "cursor {0}",
+    "subl": "subl {0}",
+    "atom": "atom {0}",
+}
+
+# Map notification types to appropriate handling. A message of None
+# means "use the message from the hook payload"
+NOTIFICATION_CONFIGS = {
+    "permission_prompt": {
+        "title": "Permission Required",
+        "subtitle": "Claude needs approval",
+        "message": None,
+        "sound": "Basso",  # More urgent sound
+        "urgency": "critical",
+        "action": "focus"  # Should focus immediately
+    },
+    "idle_prompt": {
+        "title": "Waiting for Input",
+        "subtitle": "Claude is idle",
+        "message": "Waiting for your input (60+ seconds)",
+        "sound": "Purr",  # Gentle sound
+        "urgency": "low",
+        "action": "focus"
+    },
+    "elicitation_dialog": {
+        "title": "Input Needed",
+        "subtitle": "MCP tool requires input",
+        "message": None,
+        "sound": "Ping",
+        "urgency": "high",
+        "action": "focus"
+    },
+    "auth_success": {
+        "title": "Authentication Success",
+        "subtitle": "Logged in successfully",
+        "message": None,
+        "sound": "Glass",
+        "urgency": "low",
+        "action": "none"
+    },
+}
+
+DEFAULT_NOTIFICATION_CONFIG = {
+    "title": "Claude Code",
+    "subtitle": "Notification",
+    "message": None,
+    "sound": NOTIFICATION_SOUND,
+    "urgency": "normal",
+    "action": "focus",
+}
+
+# Socket where claude-notifier-daemon.py listens (see that script);
+# when the daemon is up, hooks hand off the payload and exit without
+# paying interpreter/sqlite startup costs
+SOCKET_PATH = Path.home() / ".claude" / "notifier" / "hook.sock"
+
 
 class ClaudeNotifier:
     def __init__(self):
-        """Initialize with database and logging"""
+        """Initialize paths; database and logging are set up lazily"""
         self.base_dir = Path.home() / ".claude" / "notifier"
-        self.base_dir.mkdir(parents=True, exist_ok=True)
-
         self.db_path = self.base_dir / "sessions.db"
-        self.log_path = self.base_dir / "notifier.log"
-
-        self.setup_logging()
-        self.init_database()
+        # Daily-suffixed log file; retention is handled by
+        # _cleanup_old_logs rather than a rotating handler
+        self.log_path = self.base_dir / f"notifier-{datetime.now():%Y%m%d}.log"
+
+        # Each hook spawns a fresh process, so defer sqlite and log-file
+        # setup to first use — notification-only hooks (SubagentStop,
+        # SessionStart, SessionEnd) never pay for the database
+        self._db_ready = False
+        self._log_ready = False
+
+    def _ensure_logging(self):
+        """Set up the log handler on first use"""
+        if not self._log_ready:
+            self.base_dir.mkdir(parents=True, exist_ok=True)
+            self.setup_logging()
+            self._log_ready = True
+
+    def _ensure_db(self):
+        """Open and initialize the database on first use"""
+        if not self._db_ready:
+            self.base_dir.mkdir(parents=True, exist_ok=True)
+            self.init_database()
+            self._db_ready = True
+
+    LOG_RETENTION_DAYS = 7
+
+    def _cleanup_old_logs(self):
+        """Remove daily log files older than LOG_RETENTION_DAYS"""
+        cutoff = time.time() - self.LOG_RETENTION_DAYS * 86400
+        for path in self.base_dir.glob("notifier-*.log"):
+            try:
+                if path.stat().st_mtime < cutoff:
+                    path.unlink()
+            except OSError:
+                pass
 
     def setup_logging(self):
-        """Setup logging with daily rotation"""
-        handler = TimedRotatingFileHandler(
-            self.log_path,
-            when="midnight",
-            interval=1,
-            backupCount=7,
-            encoding="utf-8",
-        )
+        """Setup logging to a daily-suffixed file.
+
+        A plain append FileHandler instead of TimedRotatingFileHandler:
+        each hook writes 1-2 records and exits, so the rollover check
+        (an os.stat per record) was pure overhead. The date lives in the
+        filename and retention is a cheap once-per-process cleanup.
+
+        Records go through a MemoryHandler so INFO lines coalesce into
+        one write instead of a syscall per line — this matters most in
+        daemon mode. ERROR flushes immediately; atexit covers the
+        single-shot hook processes.
+        """
+        file_handler = logging.FileHandler(self.log_path, mode="a", encoding="utf-8")
 
         formatter = logging.Formatter(
             "%(asctime)s - %(levelname)s - %(message)s",
             datefmt="%Y-%m-%d %H:%M:%S"
         )
-        handler.setFormatter(formatter)
+        file_handler.setFormatter(formatter)
+
+        buffered_handler = MemoryHandler(
+            capacity=64,
+            flushLevel=logging.ERROR,
+            target=file_handler,
+            flushOnClose=True,
+        )
 
         logger = logging.getLogger()
         logger.setLevel(logging.INFO)
-        logger.addHandler(handler)
+        logger.addHandler(buffered_handler)
+        atexit.register(buffered_handler.flush)
+
+        self._cleanup_old_logs()
+
+    def _connect(self):
+        """Open a connection tuned for short-lived hook writes.
+
+        WAL lets concurrent hook processes read while one writes, and
+        synchronous=NORMAL drops the per-statement fsync that dominates
+        hook latency. isolation_level=None so we control transactions
+        explicitly with BEGIN IMMEDIATE ... COMMIT.
+        """
+        conn = sqlite3.connect(self.db_path, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA busy_timeout=5000")
+        return conn
+
+    SCHEMA_VERSION = 2
 
     def init_database(self):
         """Create tables for session tracking"""
-        with sqlite3.connect(self.db_path) as conn:
-            # Track prompts/tasks
+        with self._connect() as conn:
+            # Skip the DDL entirely once the schema is in place — hooks
+            # fire per event, so steady-state startup should cost one
+            # pragma read, not two CREATE statement parses
+            if conn.execute("PRAGMA user_version").fetchone()[0] >= self.SCHEMA_VERSION:
+                return
+
+            conn.execute("BEGIN IMMEDIATE")
+            # Track prompts/tasks. Timestamps are integer Unix epoch
+            # seconds so duration is a plain subtraction instead of
+            # julianday() text parsing in the SQL VM
             conn.execute("""
                 CREATE TABLE IF NOT EXISTS tasks (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
                     session_id TEXT NOT NULL,
-                    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                    created_at INTEGER NOT NULL DEFAULT (unixepoch()),
                     prompt TEXT,
                     cwd TEXT,
                     seq INTEGER,
-                    completed_at DATETIME,
+                    completed_at INTEGER,
                     duration_seconds INTEGER
                 )
             """)
 
-            # Auto-increment seq per session
+            # v1 databases stored DATETIME text; convert in place
             conn.execute("""
-                CREATE TRIGGER IF NOT EXISTS auto_seq
-                AFTER INSERT ON tasks
-                FOR EACH ROW
-                BEGIN
-                    UPDATE tasks
-                    SET seq = (
-                        SELECT COALESCE(MAX(seq), 0) + 1
-                        FROM tasks
-                        WHERE session_id = NEW.session_id
-                    )
-                    WHERE id = NEW.id;
-                END
+                UPDATE tasks SET created_at = unixepoch(created_at)
+                WHERE typeof(created_at) = 'text'
+            """)
+            conn.execute("""
+                UPDATE tasks SET completed_at = unixepoch(completed_at)
+                WHERE typeof(completed_at) = 'text'
             """)
 
-            conn.commit()
+            # seq is computed inline at INSERT time (see
+            # handle_user_prompt_submit); a stale auto_seq trigger from
+            # older installs would double-assign it, so drop it.
+            conn.execute("DROP TRIGGER IF EXISTS auto_seq")
+
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_tasks_session ON tasks(session_id)"
+            )
+            # Partial index so the open-task lookup in handle_stop is an
+            # index seek instead of an ORDER BY + LIMIT scan
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_tasks_session_open
+                ON tasks(session_id, completed_at)
+                WHERE completed_at IS NULL
+            """)
+
+            conn.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+            conn.execute("COMMIT")
 
     # ========================================================================
     # Hook Handlers
     # ========================================================================
 
+    def dispatch(self, hook_event, data):
+        """Route a hook event to its handler; returns False if unknown"""
+        handler_name = HANDLERS.get(hook_event)
+        if handler_name is None:
+            logging.warning(f"Unknown hook event: {hook_event}")
+            return False
+
+        getattr(self, handler_name)(data)
+        return True
+
     def handle_user_prompt_submit(self, data):
         """UserPromptSubmit: Record task start"""
         session_id = data.get("session_id")
         prompt = data.get("prompt", "")
         cwd = data.get("cwd", "")
 
-        with sqlite3.connect(self.db_path) as conn:
+        self._ensure_db()
+        self._ensure_logging()
+
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
             conn.execute(
-                "INSERT INTO tasks (session_id, prompt, cwd) VALUES (?, ?, ?)",
-                (session_id, prompt, cwd)
+                """
+                INSERT INTO tasks (session_id, prompt, cwd, created_at, seq)
+                VALUES (?, ?, ?, ?, COALESCE(
+                    (SELECT MAX(seq) FROM tasks WHERE session_id = ?), 0
+                ) + 1)
+                """,
+                (session_id, prompt, cwd, int(time.time()), session_id)
             )
-            conn.commit()
+            conn.execute("COMMIT")
 
         logging.info(f"Task started: session={session_id}")
 
@@ -120,55 +283,52 @@ class ClaudeNotifier:
         session_id = data.get("session_id")
         cwd = data.get("cwd", "")
 
-        with sqlite3.connect(self.db_path) as conn:
-            # Find latest incomplete task
+        self._ensure_db()
+        self._ensure_logging()
+
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+
+            # Complete the latest open task and read back seq/duration in
+            # one statement (RETURNING needs SQLite >= 3.35). id breaks
+            # ties between tasks created in the same second — created_at
+            # has whole-second resolution
             cursor = conn.execute(
                 """
-                SELECT id, created_at, seq
-                FROM tasks
-                WHERE session_id = ? AND completed_at IS NULL
-                ORDER BY created_at DESC
-                LIMIT 1
+                UPDATE tasks
+                SET completed_at = unixepoch(),
+                    duration_seconds = unixepoch() - created_at
+                WHERE id = (
+                    SELECT id FROM tasks
+                    WHERE session_id = ? AND completed_at IS NULL
+                    ORDER BY created_at DESC, id DESC
+                    LIMIT 1
+                )
+                RETURNING seq, duration_seconds
                 """,
                 (session_id,)
             )
 
             row = cursor.fetchone()
-            if row:
-                task_id, created_at, seq = row
-
-                # Update completion
-                conn.execute(
-                    """
-                    UPDATE tasks
-                    SET completed_at = CURRENT_TIMESTAMP,
-                        duration_seconds = (
-                            CAST((julianday(CURRENT_TIMESTAMP) - julianday(?)) * 86400 AS INTEGER)
-                        )
-                    WHERE id = ?
-                    """,
-                    (created_at, task_id)
-                )
-                conn.commit()
+            conn.execute("COMMIT")
 
-                # Get duration
-                cursor = conn.execute(
-                    "SELECT duration_seconds FROM tasks WHERE id = ?",
-                    (task_id,)
-                )
-                duration_secs = cursor.fetchone()[0]
-                duration_str = self.format_duration(duration_secs)
-
-                self.send_notification(
-                    title=self.get_project_name(cwd),
-                    subtitle=f"Task #{seq} complete",
-                    message=f"Duration: {duration_str}",
-                    sound=NOTIFICATION_SOUND,
-                    cwd=cwd,
-                    urgency="normal"
-                )
+        if not row:
+            return
 
-                logging.info(f"Task completed: session={session_id}, seq={seq}, duration={duration_str}")
+        seq, duration_secs = row
+
+        duration_str = self.format_duration(duration_secs)
+
+        self.send_notification(
+            title=self.get_project_name(cwd),
+            subtitle=f"Task #{seq} complete",
+            message=f"Duration: {duration_str}",
+            sound=NOTIFICATION_SOUND,
+            cwd=cwd,
+            urgency="normal"
+        )
+
+        logging.info(f"Task completed: session={session_id}, seq={seq}, duration={duration_str}")
 
     def handle_subagent_stop(self, data):
         """SubagentStop: Subagent task completed"""
@@ -190,58 +350,12 @@ class ClaudeNotifier:
         cwd = data.get("cwd", "")
         session_id = data.get("session_id")
 
-        # Map notification types to appropriate handling
-        notification_configs = {
-            "permission_prompt": {
-                "title": "Permission Required",
-                "subtitle": "Claude needs approval",
-                "message": message,
-                "sound": "Basso",  # More urgent sound
-                "urgency": "critical",
-                "action": "focus"  # Should focus immediately
-            },
-            "idle_prompt": {
-                "title": "Waiting for Input",
-                "subtitle": "Claude is idle",
-                "message": "Waiting for your input (60+ seconds)",
-                "sound": "Purr",  # Gentle sound
-                "urgency": "low",
-                "action": "focus"
-            },
-            "elicitation_dialog": {
-                "title": "Input Needed",
-                "subtitle": "MCP tool requires input",
-                "message": message,
-                "sound": "Ping",
-                "urgency": "high",
-                "action": "focus"
-            },
-            "auth_success": {
-                "title": "Authentication Success",
-                "subtitle": "Logged in successfully",
-                "message": message,
-                "sound": "Glass",
-                "urgency": "low",
-                "action": "none"
-            }
-        }
-
-        config = notification_configs.get(
-            notification_type,
-            {
-                "title": "Claude Code",
-                "subtitle": "Notification",
-                "message": message,
-                "sound": NOTIFICATION_SOUND,
-                "urgency": "normal",
-                "action": "focus"
-            }
-        )
+        config = NOTIFICATION_CONFIGS.get(notification_type, DEFAULT_NOTIFICATION_CONFIG)
 
         self.send_notification(
             title=config["title"],
             subtitle=config["subtitle"],
-            message=config["message"],
+            message=config["message"] or message,
             sound=config["sound"],
             cwd=cwd if config["action"] == "focus" else None,
             urgency=config["urgency"]
@@ -290,6 +404,7 @@ class ClaudeNotifier:
 
     def send_notification(self, title, subtitle, message, sound, cwd=None, urgency="normal"):
         """Send notification via terminal-notifier with optional click action"""
+        self._ensure_logging()
         try:
             cmd = [
                 "terminal-notifier",
@@ -305,12 +420,15 @@ class ClaudeNotifier:
                 if execute_cmd:
                     cmd.extend(["-execute", execute_cmd])
 
-            # Run notification
-            subprocess.run(
+            # Fire and forget — we never read terminal-notifier's output
+            # or exit status, so don't block the hook on its GUI round
+            # trip (often 100-400 ms)
+            subprocess.Popen(
                 cmd,
-                check=False,
-                capture_output=True,
-                timeout=5
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                start_new_session=True,
             )
 
             logging.info(f"Sent notification: {title} - {subtitle}")
@@ -319,11 +437,12 @@ class ClaudeNotifier:
             # Fallback to osascript if terminal-notifier not found
             try:
                 applescript = f'display notification "{message}" with title "{title}" subtitle "{subtitle}" sound name "{sound}"'
-                subprocess.run(
+                subprocess.Popen(
                     ["osascript", "-e", applescript],
-                    check=False,
-                    capture_output=True,
-                    timeout=5
+                    stdin=subprocess.DEVNULL,
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.DEVNULL,
+                    start_new_session=True,
                 )
                 logging.info(f"Sent notification via osascript: {title}")
             except Exception as e:
@@ -336,16 +455,11 @@ class ClaudeNotifier:
         if not cwd or not EDITOR_COMMAND:
             return None
 
-        # Map editor commands to their open syntax
-        editor_cmds = {
-            "zed": f'zed "{cwd}"',
-            "code": f'/usr/local/bin/code "{cwd}"',
-            "cursor": f'cursor "{cwd}"',
-            "subl": f'subl "{cwd}"',
-            "atom": f'atom "{cwd}"',
-        }
-
-        return editor_cmds.get(EDITOR_COMMAND, f'{EDITOR_COMMAND} "{cwd}"')
+        # shlex.quote so paths with spaces/quotes/$ survive the shell
+        # that terminal-notifier's -execute runs them through
+        quoted = shlex.quote(cwd)
+        template = EDITOR_TEMPLATES.get(EDITOR_COMMAND, EDITOR_COMMAND + " {0}")
+        return template.format(quoted)
 
     # ========================================================================
     # Utilities
@@ -359,20 +473,47 @@ class ClaudeNotifier:
 
     def format_duration(self, seconds):
         """Format duration in human-readable format"""
-        if seconds < 60:
-            return f"{seconds}s"
-        elif seconds < 3600:
-            minutes = seconds // 60
-            secs = seconds % 60
-            return f"{minutes}m {secs}s" if secs > 0 else f"{minutes}m"
-        else:
-            hours = seconds // 3600
-            minutes = (seconds % 3600) // 60
-            return f"{hours}h {minutes}m" if minutes > 0 else f"{hours}h"
+        hours, rem = divmod(seconds, 3600)
+        minutes, secs = divmod(rem, 60)
+        if hours:
+            return f"{hours}h {minutes}m" if minutes else f"{hours}h"
+        if minutes:
+            return f"{minutes}m {secs}s" if secs else f"{minutes}m"
+        return f"{secs}s"
+
+
+# Hook event -> ClaudeNotifier method name. Method names (not bound
+# methods) so subclasses like the daemon's BufferedNotifier keep their
+# overrides, and the table isn't rebuilt per invocation
+HANDLERS = {
+    "UserPromptSubmit": "handle_user_prompt_submit",
+    "Stop": "handle_stop",
+    "SubagentStop": "handle_subagent_stop",
+    "Notification": "handle_notification",
+    "SessionStart": "handle_session_start",
+    "SessionEnd": "handle_session_end",
+}
+
+
+def send_to_daemon(hook_event, raw):
+    """Hand the payload to a running notifier daemon, if any.
+
+    Returns True if the daemon accepted it; False means no daemon is
+    listening and the caller should handle the event in-process.
+    """
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+    try:
+        sock.connect(str(SOCKET_PATH))
+        sock.sendall(hook_event.encode("utf-8") + b"\n" + raw)
+        return True
+    except OSError:
+        return False
+    finally:
+        sock.close()
 
 
 def main():
-    """Main entry point - route to appropriate handler"""
+    """Main entry point - forward to the daemon or handle in-process"""
     try:
         # Read hook event from command line
         if len(sys.argv) < 2:
@@ -382,37 +523,32 @@ def main():
 
         hook_event = sys.argv[1]
 
-        # Read JSON data from stdin
-        input_data = sys.stdin.read().strip()
-        if not input_data:
+        # Read JSON data from stdin as bytes — json.loads handles UTF-8
+        # bytes natively (and skips leading whitespace itself), so the
+        # text wrapper's locale decode is unnecessary
+        raw = sys.stdin.buffer.read()
+        if not raw.strip():
             logging.warning(f"No input data for {hook_event}")
             sys.exit(0)
 
-        data = json.loads(input_data)
-
-        # Validate hook_event_name matches
-        if data.get("hook_event_name") != hook_event:
-            logging.warning(f"Hook mismatch: expected {hook_event}, got {data.get('hook_event_name')}")
+        # Fast path: a long-lived daemon (claude-notifier-daemon.py)
+        # amortizes interpreter and sqlite startup across the session
+        if send_to_daemon(hook_event, raw):
+            return
 
-        # Route to handler
-        notifier = ClaudeNotifier()
+        data = json.loads(raw)
 
-        handlers = {
-            "UserPromptSubmit": notifier.handle_user_prompt_submit,
-            "Stop": notifier.handle_stop,
-            "SubagentStop": notifier.handle_subagent_stop,
-            "Notification": notifier.handle_notification,
-            "SessionStart": notifier.handle_session_start,
-            "SessionEnd": notifier.handle_session_end,
-        }
+        # hook_event_name from the payload is authoritative; argv is
+        # only a fallback for payloads that omit it
+        event = data.get("hook_event_name") or hook_event
 
-        handler = handlers.get(hook_event)
-        if handler:
-            handler(data)
-        else:
-            logging.warning(f"Unknown hook event: {hook_event}")
+        # Only pay for construction once the dispatch target is known
+        if event not in HANDLERS:
+            logging.warning(f"Unknown hook event: {event}")
             sys.exit(1)
 
+        ClaudeNotifier().dispatch(event, data)
+
     except json.JSONDecodeError as e:
         logging.error(f"JSON decode error: {e}")
         sys.exit(1)
@@ -1,22 +1,38 @@
 #!/usr/bin/env python3
 """Claude Code configuration management"""
+import functools
 import sys
 import os
 import json
+import tomllib
 from pathlib import Path
 from typing import Dict, Any, Optional
-import tomli
-import tomli_w
-from rich.console import Console
-from rich.table import Table
 
-console = Console()
+
+@functools.cache
+def _console():
+    """Lazily import rich — it dominates startup time for fast commands"""
+    from rich.console import Console
+    return Console()
+
 
 CONFIG_DIR = Path.home() / ".claude" / "configs"
 # Auto-detect repo location (tools/ is one level down from repo root)
 REPO_DIR = Path(__file__).parent.parent.resolve()
 
 
+def atomic_write_text(path: Path, text: str) -> None:
+    """Write via a temp file + os.replace so readers never see a torn file.
+
+    A crash mid-write_text would leave e.g. a zero-byte current_mode that
+    breaks status() until reinstall; POSIX rename swaps the inode in one
+    step.
+    """
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_text(text)
+    os.replace(tmp, path)
+
+
 def get_active_profile_dir() -> Optional[Path]:
     """Detect active profile directory from CLAUDE_CONFIG_DIR or current symlink"""
     env_dir = os.environ.get("CLAUDE_CONFIG_DIR")
@@ -32,16 +48,29 @@ def get_active_profile_dir() -> Optional[Path]:
     return None
 
 
-def load_config(mode: str) -> Dict[str, Any]:
-    """Load mode config with personal overrides"""
+def _mtime_or_none(path: Path) -> Optional[float]:
+    """File mtime, or None if it doesn't exist"""
+    try:
+        return path.stat().st_mtime
+    except FileNotFoundError:
+        return None
+
+
+@functools.lru_cache(maxsize=4)
+def _load_config_cached(
+    mode: str,
+    base_mtime: Optional[float],
+    personal_mtime: Optional[float],
+) -> Dict[str, Any]:
+    """Parse and merge the TOML files; mtimes only serve as cache keys"""
     base_path = REPO_DIR / f"configs/{mode}.toml"
     with open(base_path, "rb") as f:
-        config = tomli.load(f)
+        config = tomllib.load(f)
 
     personal_path = CONFIG_DIR / "personal.toml"
-    if personal_path.exists():
+    if personal_mtime is not None:
         with open(personal_path, "rb") as f:
-            personal = tomli.load(f)
+            personal = tomllib.load(f)
 
         for section, values in personal.items():
             if section in config:
@@ -52,6 +81,17 @@ def load_config(mode: str) -> Dict[str, Any]:
     return config
 
 
+def load_config(mode: str) -> Dict[str, Any]:
+    """Load mode config with personal overrides.
+
+    Cached on mode + source-file mtimes, so flows that load the same
+    config twice (e.g. switch_mode ending in status()) parse it once.
+    """
+    base_mtime = _mtime_or_none(REPO_DIR / f"configs/{mode}.toml")
+    personal_mtime = _mtime_or_none(CONFIG_DIR / "personal.toml")
+    return _load_config_cached(mode, base_mtime, personal_mtime)
+
+
 def _build_env_vars(config: Dict[str, Any]) -> Dict[str, str]:
     """Build env var dict from config"""
     mode = config["mode"]
@@ -116,9 +156,9 @@ def _apply_to_profile(
         settings = {"mcpServers": {}, "env": {}}
 
     if dry_run:
-        console.print(f"\n[dim]Would update {settings_path}:[/dim]")
+        _console().print(f"\n[dim]Would update {settings_path}:[/dim]")
         for k, v in env_vars.items():
-            console.print(f"  {k}={v}")
+            _console().print(f"  {k}={v}")
         return
 
     existing_env = settings.get("env", {})
@@ -128,8 +168,8 @@ def _apply_to_profile(
     with open(settings_path, "w") as f:
         json.dump(settings, f, indent=2)
 
-    console.print(f"[green]Applied {mode_name} config → {settings_path}[/green]")
-    console.print(f"[dim]  Profile: {profile_dir.name}[/dim]")
+    _console().print(f"[green]Applied {mode_name} config → {settings_path}[/green]")
+    _console().print(f"[dim]  Profile: {profile_dir.name}[/dim]")
 
 
 def _apply_to_env_file(
@@ -138,25 +178,33 @@ def _apply_to_env_file(
     dry_run: bool,
 ) -> None:
     """Legacy: write to ~/.claude/configs/<mode>.env (no active profile)"""
-    exports = [f"export {k}='{v}'" for k, v in env_vars.items()]
-    script = "\n".join(exports)
+    # One pass, one write_text below — no intermediate list
+    script = "\n".join(f"export {k}='{v}'" for k, v in env_vars.items())
 
     if dry_run:
-        console.print(script)
+        # Raw shell script — keep it out of rich's markup handling
+        print(script)
     else:
         out_file = CONFIG_DIR / f"{mode_name}.env"
-        out_file.write_text(script)
-        console.print(f"[green]Applied {mode_name} config to {out_file}[/green]")
+        atomic_write_text(out_file, script)
+        _console().print(f"[green]Applied {mode_name} config to {out_file}[/green]")
 
 
-def status() -> None:
-    """Show current config status"""
-    current_mode_file = CONFIG_DIR / "current_mode"
-    if not current_mode_file.exists():
-        console.print("[red]No mode configured[/red]")
-        return
+def status(mode: Optional[str] = None) -> None:
+    """Show current config status.
+
+    Callers that already know the active mode (switch_mode just wrote
+    it) pass it in to skip re-reading the current_mode file.
+    """
+    if mode is None:
+        current_mode_file = CONFIG_DIR / "current_mode"
+        if not current_mode_file.exists():
+            _console().print("[red]No mode configured[/red]")
+            return
+        mode = current_mode_file.read_text().strip()
+
+    from rich.table import Table
 
-    mode = current_mode_file.read_text().strip()
     config = load_config(mode)
     profile_dir = get_active_profile_dir()
 
@@ -179,53 +227,58 @@ def status() -> None:
         table.add_row("AWS Region", config.get("aws", {}).get("region", "N/A"))
         table.add_row("AWS Profile", config.get("aws", {}).get("profile", "N/A"))
 
-    console.print(table)
+    _console().print(table)
 
 
 def sync_profile() -> None:
     """Re-apply current mode config to the active profile's settings.json"""
     profile_dir = get_active_profile_dir()
     if not profile_dir:
-        console.print("[yellow]No active profile detected.[/yellow]")
-        console.print("[dim]Set CLAUDE_CONFIG_DIR or use 'ccp <name>' first.[/dim]")
-        console.print("[dim]Falling back to legacy .env mode...[/dim]")
+        _console().print("[yellow]No active profile detected.[/yellow]")
+        _console().print("[dim]Set CLAUDE_CONFIG_DIR or use 'ccp <name>' first.[/dim]")
+        _console().print("[dim]Falling back to legacy .env mode...[/dim]")
 
     current_mode_file = CONFIG_DIR / "current_mode"
     if not current_mode_file.exists():
-        console.print("[red]No mode configured. Run: make install[/red]")
+        _console().print("[red]No mode configured. Run: make install[/red]")
         return
 
     mode = current_mode_file.read_text().strip()
 
     if profile_dir:
-        console.print(
+        _console().print(
             f"Syncing [cyan]{mode}[/cyan] config → "
             f"profile [cyan]{profile_dir.name}[/cyan]"
         )
     else:
-        console.print(f"Syncing [cyan]{mode}[/cyan] config → legacy .env")
+        _console().print(f"Syncing [cyan]{mode}[/cyan] config → legacy .env")
 
     config = load_config(mode)
     apply_config(config)
-    console.print()
-    status()
+    _console().print()
+    status(mode)
 
 
 def switch_mode(mode: str) -> None:
     """Switch to a different mode and apply to active profile or .env"""
     if mode not in ["anthropic", "bedrock"]:
-        console.print(f"[red]Invalid mode: {mode}[/red]")
-        console.print("Available: anthropic, bedrock")
+        _console().print(f"[red]Invalid mode: {mode}[/red]")
+        _console().print("Available: anthropic, bedrock")
         sys.exit(1)
 
     config = load_config(mode)
     apply_config(config)
 
     current_mode_file = CONFIG_DIR / "current_mode"
-    current_mode_file.write_text(mode)
+    atomic_write_text(current_mode_file, mode)
+
+    # Re-render the notification patches so enable_hooks picks up the
+    # mode we just switched to
+    from notifications import compile_patches
+    compile_patches()
 
-    console.print(f"[green]Switched to {mode} mode[/green]")
-    status()
+    _console().print(f"[green]Switched to {mode} mode[/green]")
+    status(mode)
 
 
 def switch_interactive() -> None:
@@ -234,24 +287,24 @@ def switch_interactive() -> None:
 
     current_mode_file = CONFIG_DIR / "current_mode"
     if not current_mode_file.exists():
-        console.print("[yellow]No mode configured. Run: make install[/yellow]")
+        _console().print("[yellow]No mode configured. Run: make install[/yellow]")
         sys.exit(1)
 
     current_mode = current_mode_file.read_text().strip()
     other_mode = "bedrock" if current_mode == "anthropic" else "anthropic"
 
-    console.print(f"\n[cyan]Current mode:[/cyan] {current_mode}")
-    console.print(f"[cyan]Switch to:[/cyan] {other_mode}\n")
+    _console().print(f"\n[cyan]Current mode:[/cyan] {current_mode}")
+    _console().print(f"[cyan]Switch to:[/cyan] {other_mode}\n")
 
     if Confirm.ask(f"Switch to {other_mode} mode?", default=False):
         switch_mode(other_mode)
     else:
-        console.print("[yellow]Switch cancelled[/yellow]")
+        _console().print("[yellow]Switch cancelled[/yellow]")
 
 
 if __name__ == "__main__":
     if len(sys.argv) < 2:
-        console.print("[red]Usage: config.py <command> [args][/red]")
+        _console().print("[red]Usage: config.py <command> [args][/red]")
         sys.exit(1)
 
     command = sys.argv[1]
@@ -260,7 +313,7 @@ if __name__ == "__main__":
         status()
     elif command == "switch":
         if len(sys.argv) < 3:
-            console.print("[red]Usage: config.py switch <mode>[/red]")
+            _console().print("[red]Usage: config.py switch <mode>[/red]")
             sys.exit(1)
         switch_mode(sys.argv[2])
     elif command == "switch-interactive":
@@ -268,5 +321,5 @@ if __name__ == "__main__":
     elif command == "sync-profile":
         sync_profile()
     else:
-        console.print(f"[red]Unknown command: {command}[/red]")
+        _console().print(f"[red]Unknown command: {command}[/red]")
         sys.exit(1)
@@ -33,17 +33,19 @@ def install():
         default="anthropic"
     )
 
-    current_mode_file = CONFIG_DIR / "current_mode"
-    current_mode_file.write_text(mode)
-
     # Generate initial .env file for the chosen mode
     import sys
     sys.path.insert(0, str(REPO_DIR / "tools"))
-    from config import load_config, apply_config
+    from config import load_config, apply_config, atomic_write_text
+    from notifications import compile_patches
+
+    current_mode_file = CONFIG_DIR / "current_mode"
+    atomic_write_text(current_mode_file, mode)
 
     console.print(f"[cyan]Generating {mode}.env configuration...[/cyan]")
     config = load_config(mode)
     apply_config(config)
+    compile_patches()
 
     # Save version
     version_file = REPO_DIR / "VERSION"
@@ -51,25 +53,28 @@ def install():
         user_version_file = CONFIG_DIR / ".version"
         user_version_file.write_text(version_file.read_text())
 
-    # Add to shell config
+    # Add to shell config — read .zshrc once and append any missing
+    # lines in a single open
     zshrc = Path.home() / ".zshrc"
     source_line = f"source {REPO_DIR}/shell/zsh-functions.sh"
+    alias_line = f"alias claude-switch='make -C {REPO_DIR} switch'"
 
     if zshrc.exists():
         content = zshrc.read_text()
-        if source_line not in content:
+        need_source = source_line not in content
+        need_alias = "alias claude-switch=" not in content
+
+        if need_source or need_alias:
             with open(zshrc, "a") as f:
-                f.write(f"\n# Claude Code Config (auto-detected location)\n{source_line}\n")
+                if need_source:
+                    f.write(f"\n# Claude Code Config (auto-detected location)\n{source_line}\n")
+                if need_alias:
+                    f.write(f"\n# Claude mode switching alias (switch from anywhere)\n{alias_line}\n")
+
+        if need_source:
             console.print(f"[green]Added to {zshrc}[/green]")
             console.print(f"[yellow]Note: Shell functions sourced from {REPO_DIR}[/yellow]")
-
-    # Add claude-switch alias for convenience
-    alias_line = f"alias claude-switch='make -C {REPO_DIR} switch'"
-    if zshrc.exists():
-        content = zshrc.read_text()
-        if "alias claude-switch=" not in content:
-            with open(zshrc, "a") as f:
-                f.write(f"\n# Claude mode switching alias (switch from anywhere)\n{alias_line}\n")
+        if need_alias:
             console.print(f"[green]Added claude-switch alias to {zshrc}[/green]")
 
     console.print("\n[bold green]Installation complete![/bold green]")
@@ -6,21 +6,50 @@ Manages notification backends, installation, and hooks configuration.
 """
 
 from pathlib import Path
+import copy
+import functools
 import json
+import os
+import re
 import subprocess
 import sys
+import types
 from typing import Optional
 import shutil
 
+# Prefer a native-code TOML parser: rtoml (Rust) when installed, else
+# stdlib tomllib (3.11+), else pure-Python tomli
 try:
-    import tomli
-    import tomli_w
-    from rich.console import Console
-    from rich.table import Table
-    from rich.panel import Panel
+    from rtoml import loads as _toml_loads
+except ImportError:
+    try:
+        from tomllib import loads as _toml_loads
+    except ImportError:
+        from tomli import loads as _toml_loads
+
+# Prefer orjson for settings.json — its Rust encoder/decoder is several
+# times faster than stdlib json; both branches emit 2-space-indented
+# output because settings.json is hand-edited by users
+try:
+    import orjson
+
+    def _json_dumps(obj) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+
+    _json_loads = orjson.loads
 except ImportError:
-    print("Error: Required dependencies not found. Run: make install", file=sys.stderr)
-    sys.exit(1)
+    def _json_dumps(obj) -> bytes:
+        return json.dumps(obj, indent=2).encode("utf-8")
+
+    _json_loads = json.loads
+
+
+@functools.cache
+def _console():
+    """Lazily import rich — fast commands shouldn't pay its import cost"""
+    from rich.console import Console
+    return Console()
+
 
 # Auto-detect repository location
 REPO_DIR = Path(__file__).parent.parent.resolve()
@@ -28,11 +57,13 @@ CONFIG_DIR = Path.home() / ".claude" / "configs"
 SETTINGS_FILE = Path.home() / ".claude" / "settings.json"
 NOTIFICATIONS_DIR = REPO_DIR / "shell" / "notifications"
 TEMPLATES_DIR = REPO_DIR / "settings"
+PATCH_DIR = CONFIG_DIR / "patches"
 
-console = Console()
 
-# Backend definitions
-BACKENDS = {
+# Backend definitions — read-only after import, so wrapped in a
+# MappingProxyType with the list_backends rows and the "available
+# backends" string precomputed once
+BACKENDS = types.MappingProxyType({
     "terminal-notifier": {
         "name": "terminal-notifier",
         "description": "Simple, cross-platform notifications with sound support",
@@ -63,12 +94,35 @@ BACKENDS = {
         "click_to_focus": True,
         "remote_support": True,
     },
-}
+})
+
+_BACKEND_ROWS = tuple(
+    (
+        backend_id,
+        info["description"],
+        "✅" if info["multi_instance"] else "❌",
+        "✅" if info["click_to_focus"] else "❌",
+        "✅" if info["remote_support"] else "❌",
+    )
+    for backend_id, info in BACKENDS.items()
+)
+
+_BACKEND_IDS_STR = ", ".join(BACKENDS)
+
+# Backend scripts shipped in the repo, read with one directory scan at
+# import instead of a stat syscall per .exists() probe
+_AVAILABLE_SCRIPTS = (
+    frozenset(entry.name for entry in os.scandir(NOTIFICATIONS_DIR))
+    if NOTIFICATIONS_DIR.exists()
+    else frozenset()
+)
 
 
 def list_backends():
     """List available notification backends"""
-    console.print("\n[bold blue]Available Notification Backends[/bold blue]\n")
+    from rich.table import Table
+
+    _console().print("\n[bold blue]Available Notification Backends[/bold blue]\n")
 
     table = Table(show_header=True, header_style="bold magenta")
     table.add_column("Backend", style="cyan", width=20)
@@ -77,23 +131,29 @@ def list_backends():
     table.add_column("Click-to-Focus", justify="center", width=13)
     table.add_column("Remote", justify="center", width=8)
 
-    for backend_id, info in BACKENDS.items():
-        table.add_row(
-            backend_id,
-            info["description"],
-            "✅" if info["multi_instance"] else "❌",
-            "✅" if info["click_to_focus"] else "❌",
-            "✅" if info["remote_support"] else "❌",
-        )
+    for row in _BACKEND_ROWS:
+        table.add_row(*row)
+
+    _console().print(table)
+    _console().print("\nUse: [cyan]make notifications-install BACKEND=<backend>[/cyan] to install\n")
+
+
+@functools.lru_cache(maxsize=None)
+def _which(cmd: str) -> Optional[str]:
+    """Memoized shutil.which — each miss walks all of $PATH"""
+    return shutil.which(cmd)
 
-    console.print(table)
-    console.print("\nUse: [cyan]make notifications-install BACKEND=<backend>[/cyan] to install\n")
+
+@functools.lru_cache(maxsize=None)
+def _path_exists(path: str) -> bool:
+    """Memoized existence probe for fixed install locations"""
+    return Path(path).exists()
 
 
 def check_dependencies(backend: str) -> bool:
     """Check if backend dependencies are installed"""
     if backend not in BACKENDS:
-        console.print(f"[red]Error: Unknown backend '{backend}'[/red]")
+        _console().print(f"[red]Error: Unknown backend '{backend}'[/red]")
         return False
 
     backend_info = BACKENDS[backend]
@@ -105,139 +165,268 @@ def check_dependencies(backend: str) -> bool:
             continue
 
         if dep == "Hammerspoon":
-            if not Path("/Applications/Hammerspoon.app").exists():
+            if not _path_exists("/Applications/Hammerspoon.app"):
                 missing.append(dep)
         elif dep == "cc-notifier":
-            if not Path.home().joinpath(".cc-notifier", "cc-notifier").exists():
+            if not _path_exists(str(Path.home() / ".cc-notifier" / "cc-notifier")):
                 missing.append(dep)
         else:
             # Check if command exists
-            if shutil.which(dep) is None:
+            if _which(dep) is None:
                 missing.append(dep)
 
     if missing:
-        console.print(f"[yellow]Missing dependencies for {backend}:[/yellow]")
+        _console().print(f"[yellow]Missing dependencies for {backend}:[/yellow]")
         for dep in missing:
-            console.print(f"  - {dep}")
+            _console().print(f"  - {dep}")
         return False
 
-    console.print(f"[green]All dependencies for {backend} are installed[/green]")
+    _console().print(f"[green]All dependencies for {backend} are installed[/green]")
     return True
 
 
 def install_backend(backend: str):
     """Install a notification backend"""
     if backend not in BACKENDS:
-        console.print(f"[red]Error: Unknown backend '{backend}'[/red]")
-        console.print("Available backends:", ", ".join(BACKENDS.keys()))
+        _console().print(f"[red]Error: Unknown backend '{backend}'[/red]")
+        _console().print("Available backends:", _BACKEND_IDS_STR)
         sys.exit(1)
 
     backend_info = BACKENDS[backend]
-    console.print(f"\n[bold blue]Installing {backend_info['name']}[/bold blue]\n")
+    _console().print(f"\n[bold blue]Installing {backend_info['name']}[/bold blue]\n")
 
     # Special handling for cc-notifier (runs installer script)
     if backend == "cc-notifier":
         installer_script = NOTIFICATIONS_DIR / "cc-notifier-installer.sh"
-        if not installer_script.exists():
-            console.print(f"[red]Error: Installer script not found: {installer_script}[/red]")
+        if installer_script.name not in _AVAILABLE_SCRIPTS:
+            _console().print(f"[red]Error: Installer script not found: {installer_script}[/red]")
             sys.exit(1)
 
-        console.print("Running cc-notifier installer...")
+        _console().print("Running cc-notifier installer...")
         try:
             subprocess.run([str(installer_script)], check=True)
-            console.print(f"\n[green]✓ {backend} installed successfully[/green]")
+            _console().print(f"\n[green]✓ {backend} installed successfully[/green]")
         except subprocess.CalledProcessError as e:
-            console.print(f"[red]Error installing {backend}: {e}[/red]")
+            _console().print(f"[red]Error installing {backend}: {e}[/red]")
             sys.exit(1)
     else:
         # Check dependencies
         if not check_dependencies(backend):
-            console.print(f"\n[yellow]Install missing dependencies:[/yellow]")
+            _console().print(f"\n[yellow]Install missing dependencies:[/yellow]")
             if backend == "terminal-notifier":
-                console.print("  brew install terminal-notifier")
+                _console().print("  brew install terminal-notifier")
             sys.exit(1)
 
-        console.print(f"[green]✓ {backend} is ready to use[/green]")
+        _console().print(f"[green]✓ {backend} is ready to use[/green]")
+
+    _console().print(f"\nNext step: [cyan]make notifications-enable BACKEND={backend}[/cyan]")
+
+
+# Parsed-TOML cache keyed by path; entries hold ((mtime_ns, size), doc).
+# tomli's pure-Python parse is the expensive part, so repeat loads within
+# a process (enable_hooks, test_notification, show_status all call
+# load_current_config) cost an os.stat + dict lookup instead
+_TOML_CACHE: dict = {}
+
 
-    console.print(f"\nNext step: [cyan]make notifications-enable BACKEND={backend}[/cyan]")
+def _load_toml_cached(path: Path) -> dict:
+    """Parse a TOML file, reusing the cached parse while it's unchanged.
+
+    Returns the cached object itself — callers must treat it as
+    read-only (the config merge builds new dicts rather than mutating).
+    """
+    st = path.stat()
+    key = (st.st_mtime_ns, st.st_size)
+    cached = _TOML_CACHE.get(path)
+    if cached is None or cached[0] != key:
+        # One bytes read, no file-object branch in the parser
+        _TOML_CACHE[path] = (key, _toml_loads(path.read_bytes().decode("utf-8")))
+
+    return _TOML_CACHE[path][1]
+
+
+# settings.json parse cache, keyed on mtime so commands that load the
+# file more than once per run only decode it once. Holds (st_mtime_ns,
+# parsed dict); callers get a fresh copy since they mutate the result
+_SETTINGS_CACHE: list = [None, None]
 
 
 def load_settings() -> dict:
     """Load current settings.json"""
-    if not SETTINGS_FILE.exists():
+    try:
+        stamp = SETTINGS_FILE.stat().st_mtime_ns
+    except FileNotFoundError:
         return {}
 
-    with open(SETTINGS_FILE, "r") as f:
-        return json.load(f)
+    if _SETTINGS_CACHE[0] != stamp:
+        _SETTINGS_CACHE[0] = stamp
+        _SETTINGS_CACHE[1] = _json_loads(SETTINGS_FILE.read_bytes())
+
+    return copy.deepcopy(_SETTINGS_CACHE[1])
 
 
 def save_settings(settings: dict):
     """Save settings.json"""
     SETTINGS_FILE.parent.mkdir(parents=True, exist_ok=True)
-    with open(SETTINGS_FILE, "w") as f:
-        json.dump(settings, f, indent=2)
+    # Write-then-rename so a crash mid-write can't truncate settings.json
+    tmp = SETTINGS_FILE.with_suffix(".json.tmp")
+    tmp.write_bytes(_json_dumps(settings))
+    os.replace(tmp, SETTINGS_FILE)
 
 
-def load_current_config() -> dict:
-    """Load current mode configuration with personal overrides"""
-    mode_file = CONFIG_DIR / "current_mode"
-    if not mode_file.exists():
-        console.print("[yellow]No active mode. Run: make switch MODE=anthropic[/yellow]")
-        return {}
+def _config_sources_digest(mode: str) -> str:
+    """sha256 over the raw bytes of both TOML sources for a mode"""
+    import hashlib
 
-    mode = mode_file.read_text().strip()
+    h = hashlib.sha256()
+    for path in (REPO_DIR / "configs" / f"{mode}.toml", CONFIG_DIR / "personal.toml"):
+        try:
+            h.update(path.read_bytes())
+        except FileNotFoundError:
+            h.update(b"\x00")
+    return h.hexdigest()
+
+
+def _compile_current_config(mode: str, digest: str) -> dict:
+    """Parse + merge the TOML sources and write the compiled JSON cache.
+
+    JSON decoding is C-implemented in CPython, so subsequent loads of
+    {mode}.compiled.json skip tomli's pure-Python parser entirely; the
+    stored sha256 of the sources gates staleness.
+    """
     config_file = REPO_DIR / "configs" / f"{mode}.toml"
 
     # Load base config
-    with open(config_file, "rb") as f:
-        config = tomli.load(f)
+    config = _load_toml_cached(config_file)
 
-    # Merge personal overrides
+    # Merge personal overrides into fresh dicts — never mutate the
+    # cached parse; sections without an override are shared as-is
+    merged = dict(config)
     personal_path = CONFIG_DIR / "personal.toml"
     if personal_path.exists():
-        with open(personal_path, "rb") as f:
-            personal = tomli.load(f)
+        personal = _load_toml_cached(personal_path)
 
-        # Deep merge
         for section, values in personal.items():
-            if section in config:
-                config[section].update(values)
-            else:
-                config[section] = values
+            merged[section] = {**config.get(section, {}), **values}
 
-    return config
+    (CONFIG_DIR / f"{mode}.compiled.json").write_text(json.dumps(merged))
+    (CONFIG_DIR / f"{mode}.compiled.sha256").write_text(digest)
 
+    return merged
 
-def enable_hooks(backend: str):
-    """Enable notification hooks for a backend"""
-    if backend not in BACKENDS:
-        console.print(f"[red]Error: Unknown backend '{backend}'[/red]")
-        sys.exit(1)
 
+def load_current_config() -> dict:
+    """Load current mode configuration with personal overrides"""
+    mode_file = CONFIG_DIR / "current_mode"
+    if not mode_file.exists():
+        _console().print("[yellow]No active mode. Run: make switch MODE=anthropic[/yellow]")
+        return {}
+
+    mode = mode_file.read_text().strip()
+
+    # Fast path: reuse the compiled JSON while its recorded source hash
+    # still matches; recompile lazily on any miss
+    digest = _config_sources_digest(mode)
+    compiled_file = CONFIG_DIR / f"{mode}.compiled.json"
+    digest_file = CONFIG_DIR / f"{mode}.compiled.sha256"
+    try:
+        if digest_file.read_text() == digest:
+            return json.loads(compiled_file.read_bytes())
+    except (FileNotFoundError, json.JSONDecodeError):
+        pass
+
+    return _compile_current_config(mode, digest)
+
+
+def _render_backend_patch(backend: str) -> dict:
+    """Render a backend's hook template with config substitutions applied"""
     backend_info = BACKENDS[backend]
     template_file = TEMPLATES_DIR / backend_info["template"]
 
     if not template_file.exists():
-        console.print(f"[red]Error: Template not found: {template_file}[/red]")
+        _console().print(f"[red]Error: Template not found: {template_file}[/red]")
         sys.exit(1)
 
-    # Load template
-    with open(template_file, "r") as f:
-        template = json.load(f)
-
     # Load current config for variable substitution
     config = load_current_config()
     notification_config = config.get("notifications", {})
 
-    # Substitute variables
-    template_str = json.dumps(template)
-    template_str = template_str.replace("${REPO_DIR}", str(REPO_DIR))
-    template_str = template_str.replace("${NOTIFICATION_SOUND}", notification_config.get("sound", "Glass"))
-    template_str = template_str.replace("${NOTIFICATION_EDITOR}", notification_config.get("editor", "zed"))
-    template_str = template_str.replace("${PUSHOVER_API_TOKEN}", notification_config.get("pushover_api_token", ""))
-    template_str = template_str.replace("${PUSHOVER_USER_KEY}", notification_config.get("pushover_user_key", ""))
+    subs = {
+        "REPO_DIR": str(REPO_DIR),
+        "NOTIFICATION_SOUND": notification_config.get("sound", "Glass"),
+        "NOTIFICATION_EDITOR": notification_config.get("editor", "zed"),
+        "PUSHOVER_API_TOKEN": notification_config.get("pushover_api_token", ""),
+        "PUSHOVER_USER_KEY": notification_config.get("pushover_user_key", ""),
+    }
+
+    # Parse once, then substitute ${VAR}s by walking the object tree.
+    # Only string leaves get the regex; values with JSON-significant
+    # characters (quotes, backslashes in paths) can't corrupt the
+    # document the way a raw-text substitution could
+    replace = lambda m: subs[m.group(1)]
+
+    def _subst(obj):
+        if isinstance(obj, str):
+            return _VAR_RE.sub(replace, obj)
+        if isinstance(obj, dict):
+            return {key: _subst(value) for key, value in obj.items()}
+        if isinstance(obj, list):
+            return [_subst(item) for item in obj]
+        return obj
+
+    return _subst(json.loads(template_file.read_bytes()))
+
+
+def _patch_digest() -> str:
+    """Digest gating the precompiled patches: active mode + its sources.
+
+    The mode is included alongside the source hash so switching modes
+    invalidates patches rendered under the old one.
+    """
+    try:
+        mode = (CONFIG_DIR / "current_mode").read_text().strip()
+    except FileNotFoundError:
+        mode = ""
+    return f"{mode}:{_config_sources_digest(mode)}"
+
+
+def compile_patches():
+    """Pre-render every backend's settings patch to CONFIG_DIR/patches.
+
+    Runs at install/switch time (and via the compile-patches command) so
+    enable_hooks becomes a single json.load + list extend. Each patch is
+    stored with the digest of the sources it was rendered from;
+    enable_hooks re-renders whenever that digest no longer matches.
+    """
+    PATCH_DIR.mkdir(parents=True, exist_ok=True)
+    digest = _patch_digest()
+    for backend in BACKENDS:
+        patch = _render_backend_patch(backend)
+        patch_file = PATCH_DIR / f"{backend}.json"
+        patch_file.write_bytes(_json_dumps(patch))
+        (PATCH_DIR / f"{backend}.json.sha256").write_text(digest)
+        _console().print(f"[green]Compiled patch: {patch_file}[/green]")
+
+
+def enable_hooks(backend: str):
+    """Enable notification hooks for a backend"""
+    if backend not in BACKENDS:
+        _console().print(f"[red]Error: Unknown backend '{backend}'[/red]")
+        sys.exit(1)
 
-    template = json.loads(template_str)
+    # Use the precompiled patch only while its recorded digest still
+    # matches the current config (see compile_patches); any mismatch —
+    # edited TOML, switched mode, missing files — gets a fresh render
+    # so a stale patch can't resurrect old values
+    template = None
+    try:
+        if (PATCH_DIR / f"{backend}.json.sha256").read_text() == _patch_digest():
+            template = _json_loads((PATCH_DIR / f"{backend}.json").read_bytes())
+    except FileNotFoundError:
+        pass
+
+    if template is None:
+        template = _render_backend_patch(backend)
 
     # Load existing settings
     settings = load_settings()
@@ -260,9 +449,35 @@ def enable_hooks(backend: str):
     # Save settings
     save_settings(settings)
 
-    console.print(f"\n[green]✓ Notification hooks enabled for {backend}[/green]")
-    console.print(f"Settings updated: {SETTINGS_FILE}")
-    console.print("\nTest with: [cyan]make notifications-test[/cyan]")
+    _console().print(f"\n[green]✓ Notification hooks enabled for {backend}[/green]")
+    _console().print(f"Settings updated: {SETTINGS_FILE}")
+    _console().print("\nTest with: [cyan]make notifications-test[/cyan]")
+
+
+# Template variables enable_hooks substitutes, compiled once at import.
+# Explicit alternation so anything else spelled ${...} in a template
+# passes through untouched
+_VAR_RE = re.compile(
+    r"\$\{(REPO_DIR|NOTIFICATION_SOUND|NOTIFICATION_EDITOR"
+    r"|PUSHOVER_API_TOKEN|PUSHOVER_USER_KEY)\}"
+)
+
+# Hook types the notification system installs, shared by disable_hooks
+# and show_status
+_NOTIF_HOOK_TYPES = frozenset({
+    "Stop",
+    "SubagentStop",
+    "Notification",
+    "SessionStart",
+    "SessionEnd",
+    "PermissionRequest",
+})
+
+# Commands that identify a hook entry as one of ours — a single C-level
+# regex scan instead of four Python `in` tests per inner hook
+_NOTIF_MARKERS = re.compile(
+    r"cc-notifier|osascript-notifier|terminal-notifier\.sh|claude-notifier\.py"
+)
 
 
 def disable_hooks():
@@ -270,22 +485,17 @@ def disable_hooks():
     settings = load_settings()
 
     if "hooks" not in settings:
-        console.print("[yellow]No hooks configured[/yellow]")
+        _console().print("[yellow]No hooks configured[/yellow]")
         return
 
     # Remove notification-related hooks
-    notification_hooks = ["Stop", "SubagentStop", "Notification", "SessionStart", "SessionEnd", "PermissionRequest"]
-
-    for hook_type in notification_hooks:
+    for hook_type in _NOTIF_HOOK_TYPES:
         if hook_type in settings["hooks"]:
             # Filter out notification hooks (those containing our scripts)
             settings["hooks"][hook_type] = [
                 hook for hook in settings["hooks"][hook_type]
                 if not any(
-                    "cc-notifier" in str(h.get("command", ""))
-                    or "osascript-notifier" in str(h.get("command", ""))
-                    or "terminal-notifier.sh" in str(h.get("command", ""))
-                    or "claude-notifier.py" in str(h.get("command", ""))
+                    _NOTIF_MARKERS.search(str(h.get("command", "")))
                     for h in hook.get("hooks", [])
                 )
             ]
@@ -295,7 +505,7 @@ def disable_hooks():
                 del settings["hooks"][hook_type]
 
     save_settings(settings)
-    console.print("[green]✓ Notification hooks disabled[/green]")
+    _console().print("[green]✓ Notification hooks disabled[/green]")
 
 
 def test_notification(backend: Optional[str] = None):
@@ -306,10 +516,10 @@ def test_notification(backend: Optional[str] = None):
         backend = config.get("notifications", {}).get("backend", "terminal-notifier")
 
     if backend not in BACKENDS:
-        console.print(f"[red]Error: Unknown backend '{backend}'[/red]")
+        _console().print(f"[red]Error: Unknown backend '{backend}'[/red]")
         sys.exit(1)
 
-    console.print(f"Sending test notification using {backend}...")
+    _console().print(f"Sending test notification using {backend}...")
 
     # Create test JSON input
     if backend == "claude-notifier":
@@ -322,124 +532,135 @@ def test_notification(backend: Optional[str] = None):
         test_input = json.dumps({"type": "Stop", "workingDirectory": str(Path.cwd())})
 
     if backend == "cc-notifier":
-        console.print("[yellow]Note: cc-notifier requires a Claude session to be initialized first.[/yellow]\n")
+        _console().print("[yellow]Note: cc-notifier requires a Claude session to be initialized first.[/yellow]\n")
         script = Path.home() / ".cc-notifier" / "cc-notifier"
         args = ["notify"]
+        # Installed outside the repo, so probe it (memoized) directly
+        script_available = _path_exists(str(script))
     elif backend == "claude-notifier":
         script = NOTIFICATIONS_DIR / BACKENDS[backend]["script"]
         args = ["Stop"]  # Test with Stop event
+        script_available = script.name in _AVAILABLE_SCRIPTS
     else:
         # terminal-notifier
         script = NOTIFICATIONS_DIR / BACKENDS[backend]["script"]
         args = []
+        script_available = script.name in _AVAILABLE_SCRIPTS
 
-    if not script.exists():
-        console.print(f"[red]Error: Script not found: {script}[/red]")
-        console.print(f"Run: [cyan]make notifications-install BACKEND={backend}[/cyan]")
+    if not script_available:
+        _console().print(f"[red]Error: Script not found: {script}[/red]")
+        _console().print(f"Run: [cyan]make notifications-install BACKEND={backend}[/cyan]")
         sys.exit(1)
 
     try:
+        # stdout goes to DEVNULL — only stderr matters, and only on
+        # failure, so don't buffer output we'd discard on success
         subprocess.run(
             [str(script)] + args,
             input=test_input,
             text=True,
             check=True,
-            capture_output=True
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
         )
-        console.print("[green]✓ Test notification sent[/green]")
-        console.print("\nYou should see a notification appear on your screen!")
+        _console().print("[green]✓ Test notification sent[/green]")
+        _console().print("\nYou should see a notification appear on your screen!")
     except subprocess.CalledProcessError as e:
-        console.print(f"[red]Error sending notification: {e}[/red]")
+        _console().print(f"[red]Error sending notification: {e}[/red]")
         if e.stderr:
-            console.print(f"[yellow]stderr: {e.stderr}[/yellow]")
+            _console().print(f"[yellow]stderr: {e.stderr}[/yellow]")
 
         if backend == "cc-notifier":
-            console.print("\n[yellow]This is expected if you haven't started a Claude session yet.[/yellow]")
-            console.print("[cyan]To test properly:[/cyan]")
-            console.print("  1. Start a new Claude Code session: claude")
-            console.print("  2. Give Claude a task")
-            console.print("  3. Switch to another window")
-            console.print("  4. When Claude finishes, you'll get a notification")
+            _console().print("\n[yellow]This is expected if you haven't started a Claude session yet.[/yellow]")
+            _console().print("[cyan]To test properly:[/cyan]")
+            _console().print("  1. Start a new Claude Code session: claude")
+            _console().print("  2. Give Claude a task")
+            _console().print("  3. Switch to another window")
+            _console().print("  4. When Claude finishes, you'll get a notification")
         else:
-            console.print("\n[yellow]Check if terminal-notifier is installed:[/yellow]")
-            console.print("  brew install terminal-notifier")
+            _console().print("\n[yellow]Check if terminal-notifier is installed:[/yellow]")
+            _console().print("  brew install terminal-notifier")
 
 
 def show_status():
     """Show current notification configuration status"""
-    console.print("\n[bold blue]Notification System Status[/bold blue]\n")
+    _console().print("\n[bold blue]Notification System Status[/bold blue]\n")
 
     # Check current mode
     mode_file = CONFIG_DIR / "current_mode"
     if mode_file.exists():
         mode = mode_file.read_text().strip()
-        console.print(f"Current mode: [cyan]{mode}[/cyan]")
+        _console().print(f"Current mode: [cyan]{mode}[/cyan]")
 
         # Load config
         config = load_current_config()
         if "notifications" in config:
             notif_config = config["notifications"]
-            console.print(f"Backend: [cyan]{notif_config.get('backend', 'not set')}[/cyan]")
-            console.print(f"Sound: [cyan]{notif_config.get('sound', 'not set')}[/cyan]")
+            _console().print(f"Backend: [cyan]{notif_config.get('backend', 'not set')}[/cyan]")
+            _console().print(f"Sound: [cyan]{notif_config.get('sound', 'not set')}[/cyan]")
     else:
-        console.print("[yellow]No active mode configured[/yellow]")
+        _console().print("[yellow]No active mode configured[/yellow]")
 
     # Check settings
     settings = load_settings()
     if "hooks" in settings:
-        notification_hooks = ["Stop", "SubagentStop", "Notification", "SessionStart", "SessionEnd"]
-        enabled_hooks = [h for h in notification_hooks if h in settings["hooks"]]
+        # C-level set intersection over the dict view, no Python loop
+        enabled_hooks = sorted(_NOTIF_HOOK_TYPES.intersection(settings["hooks"]))
 
         if enabled_hooks:
-            console.print(f"\nEnabled hooks: [green]{', '.join(enabled_hooks)}[/green]")
+            _console().print(f"\nEnabled hooks: [green]{', '.join(enabled_hooks)}[/green]")
         else:
-            console.print("\n[yellow]No notification hooks enabled[/yellow]")
+            _console().print("\n[yellow]No notification hooks enabled[/yellow]")
     else:
-        console.print("\n[yellow]No hooks configured[/yellow]")
+        _console().print("\n[yellow]No hooks configured[/yellow]")
 
-    console.print()
+    _console().print()
+
+
+def _require_backend_arg(command: str, handler):
+    """Run a handler that needs a backend name as its argument"""
+    if len(sys.argv) < 3:
+        _console().print("[red]Error: Backend name required[/red]")
+        _console().print(f"Example: notifications.py {command} osascript")
+        sys.exit(1)
+    handler(sys.argv[2])
+
+
+# Command dispatch table — O(1) lookup instead of an elif chain that
+# compares the command against every name before it
+COMMANDS = {
+    "list": lambda: list_backends(),
+    "install": lambda: _require_backend_arg("install", install_backend),
+    "enable": lambda: _require_backend_arg("enable", enable_hooks),
+    "disable": lambda: disable_hooks(),
+    "test": lambda: test_notification(sys.argv[2] if len(sys.argv) > 2 else None),
+    "status": lambda: show_status(),
+    "compile-patches": lambda: compile_patches(),
+}
 
 
 def main():
     """Main entry point"""
     if len(sys.argv) < 2:
-        console.print("[red]Usage: notifications.py <command> [args][/red]")
-        console.print("\nCommands:")
-        console.print("  list              - List available backends")
-        console.print("  install <backend> - Install a backend")
-        console.print("  enable <backend>  - Enable hooks for a backend")
-        console.print("  disable           - Disable all notification hooks")
-        console.print("  test [backend]    - Send a test notification")
-        console.print("  status            - Show current configuration")
+        _console().print("[red]Usage: notifications.py <command> [args][/red]")
+        _console().print("\nCommands:")
+        _console().print("  list              - List available backends")
+        _console().print("  install <backend> - Install a backend")
+        _console().print("  enable <backend>  - Enable hooks for a backend")
+        _console().print("  disable           - Disable all notification hooks")
+        _console().print("  test [backend]    - Send a test notification")
+        _console().print("  status            - Show current configuration")
+        _console().print("  compile-patches   - Pre-render settings patches for all backends")
         sys.exit(1)
 
     command = sys.argv[1]
-
-    if command == "list":
-        list_backends()
-    elif command == "install":
-        if len(sys.argv) < 3:
-            console.print("[red]Error: Backend name required[/red]")
-            console.print("Example: notifications.py install osascript")
-            sys.exit(1)
-        install_backend(sys.argv[2])
-    elif command == "enable":
-        if len(sys.argv) < 3:
-            console.print("[red]Error: Backend name required[/red]")
-            console.print("Example: notifications.py enable osascript")
-            sys.exit(1)
-        enable_hooks(sys.argv[2])
-    elif command == "disable":
-        disable_hooks()
-    elif command == "test":
-        backend = sys.argv[2] if len(sys.argv) > 2 else None
-        test_notification(backend)
-    elif command == "status":
-        show_status()
-    else:
-        console.print(f"[red]Error: Unknown command '{command}'[/red]")
+    handler = COMMANDS.get(command)
+    if handler is None:
+        _console().print(f"[red]Error: Unknown command '{command}'[/red]")
         sys.exit(1)
 
+    handler()
+
 
 if __name__ == "__main__":
     main()
@@ -1,11 +1,16 @@
 #!/usr/bin/env python3
 """Sync config templates with personal configs"""
 from pathlib import Path
-import tomli
-from rich.console import Console
-from rich.table import Table
 
-console = Console()
+# Prefer a native-code TOML parser: rtoml (Rust) when installed, else
+# stdlib tomllib (3.11+), else pure-Python tomli
+try:
+    from rtoml import loads as _toml_loads
+except ImportError:
+    try:
+        from tomllib import loads as _toml_loads
+    except ImportError:
+        from tomli import loads as _toml_loads
 
 CONFIG_DIR = Path.home() / ".claude" / "configs"
 # Auto-detect repo location (tools/ is one level down from repo root)
@@ -14,17 +19,20 @@ REPO_DIR = Path(__file__).parent.parent.resolve()
 
 def compare_configs():
     """Compare template configs with user configs"""
-    current_mode_file = CONFIG_DIR / "current_mode"
-    if not current_mode_file.exists():
+    from rich.console import Console
+
+    console = Console()
+    # Read and handle the missing case rather than stat-then-read —
+    # one syscall instead of two and no window between check and use
+    try:
+        mode = (CONFIG_DIR / "current_mode").read_text().strip()
+    except FileNotFoundError:
         console.print("[yellow]No mode configured[/yellow]")
         return
 
-    mode = current_mode_file.read_text().strip()
-
     # Load template
     template_path = REPO_DIR / f"configs/{mode}.toml"
-    with open(template_path, "rb") as f:
-        template = tomli.load(f)
+    template = _toml_loads(template_path.read_bytes().decode("utf-8"))
 
     # Load user config (if exists)
     user_env = CONFIG_DIR / f"{mode}.env"
@@ -36,10 +44,14 @@ def compare_configs():
     console.print(f"\n[bold]Comparing {mode} template with your config[/bold]\n")
 
     # Show version
-    version_file = REPO_DIR / "VERSION"
-    repo_version = version_file.read_text().strip() if version_file.exists() else "unknown"
-    user_version_file = CONFIG_DIR / ".version"
-    user_version = user_version_file.read_text().strip() if user_version_file.exists() else "unknown"
+    try:
+        repo_version = (REPO_DIR / "VERSION").read_text().strip()
+    except FileNotFoundError:
+        repo_version = "unknown"
+    try:
+        user_version = (CONFIG_DIR / ".version").read_text().strip()
+    except FileNotFoundError:
+        user_version = "unknown"
 
     console.print(f"Repo version: {repo_version}")
     console.print(f"Your version: {user_version}")
@@ -47,12 +59,16 @@ def compare_configs():
     if user_version != repo_version:
         console.print("\n[yellow]Updates available! Check CHANGELOG.md[/yellow]")
         changelog = REPO_DIR / "CHANGELOG.md"
-        if changelog.exists():
+        try:
+            # Only the head of the changelog is shown, so only read that
+            # much — no point pulling the whole file into memory
+            with open(changelog) as f:
+                head = f.read(500)
+        except FileNotFoundError:
+            pass
+        else:
             console.print("\nRecent changes:")
-            # Show relevant changelog section
-            content = changelog.read_text()
-            # Simple extraction - could be improved
-            console.print(content[:500])
+            console.print(head)
 
     console.print(f"\n[green]Review template: {template_path}[/green]")
     console.print(f"[green]Your config: {user_env}[/green]")
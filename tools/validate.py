@@ -1,9 +1,6 @@
 #!/usr/bin/env python3
 """Configuration validation"""
 from pathlib import Path
-from rich.console import Console
-
-console = Console()
 
 CONFIG_DIR = Path.home() / ".claude" / "configs"
 REPO_DIR = Path(__file__).parent.parent.resolve()
@@ -11,15 +8,19 @@ REPO_DIR = Path(__file__).parent.parent.resolve()
 
 def validate():
     """Validate current configuration"""
+    from rich.console import Console
+
+    console = Console()
     console.print("[bold]Validating configuration...[/bold]\n")
 
-    # Check if configs exist
-    current_mode_file = CONFIG_DIR / "current_mode"
-    if not current_mode_file.exists():
+    # Check if configs exist — read directly and handle the missing
+    # case, which is one syscall instead of a stat-then-read pair
+    try:
+        mode = (CONFIG_DIR / "current_mode").read_text().strip()
+    except FileNotFoundError:
         console.print("[red]No mode configured. Run 'task install' first.[/red]")
         return False
 
-    mode = current_mode_file.read_text().strip()
     env_file = CONFIG_DIR / f"{mode}.env"
 
     if not env_file.exists():